@@ -1,9 +1,26 @@
 """Top-level package for the IBKR paper trading scaffold."""
 
-from .trade_api import TradeRequest, TradeResult, execute_trade
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .trade_api import TradeRequest, TradeResult, execute_trade
 
 __all__ = [
     "TradeRequest",
     "TradeResult",
     "execute_trade",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    # PEP 562: import trade_api (pydantic, ibapi) on first use so that importing
+    # a submodule such as src.app does not pay for the whole API up front.
+    if name in __all__:
+        from . import trade_api
+
+        value = getattr(trade_api, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,24 +1,53 @@
 from __future__ import annotations
 
 import argparse
+import functools
 import json
 import sys
-from dataclasses import asdict
+from dataclasses import fields, is_dataclass
 from typing import Any, Dict
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
 from .logging import configure_logging
 from .service_api import HealthIn, PlaceIn, ValidateIn, WatchIn, run_health, run_place, run_validate, run_watch
 
 
-def _print_json(payload: Dict[str, Any]) -> None:
-    sys.stdout.write(json.dumps(payload, default=str) + "\n")
+_ORJSON_OPTIONS = (
+    (orjson.OPT_SERIALIZE_DATACLASS | orjson.OPT_NAIVE_UTC | orjson.OPT_APPEND_NEWLINE) if orjson else 0
+)
+
+
+def _print_json(payload: Any, *, flush: bool = False) -> None:
+    if orjson is None:
+        if is_dataclass(payload):
+            # Output dataclasses are flat; skip asdict's recursive deep copy.
+            payload = {f.name: getattr(payload, f.name) for f in fields(payload)}
+        sys.stdout.write(json.dumps(payload, default=str) + "\n")
+        if flush:
+            sys.stdout.flush()
+        return
+
+    # One bytes write per line (newline appended by orjson), bypassing text encoding.
+    data = orjson.dumps(payload, default=str, option=_ORJSON_OPTIONS)
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is None:
+        sys.stdout.write(data.decode())
+        return
 
+    buffer.write(data)
+    if flush or sys.stdout.line_buffering:
+        buffer.flush()
 
-def _read_payload(args: argparse.Namespace) -> str:
+
+def _read_payload(args: argparse.Namespace) -> bytes:
     if args.json:
-        return args.json
+        return args.json.encode()
     if args.json_file:
-        with open(args.json_file, "r", encoding="utf-8") as fh:
+        with open(args.json_file, "rb") as fh:
             return fh.read()
     raise ValueError("Either --json or --json-file is required")
 
@@ -26,7 +55,7 @@ def _read_payload(args: argparse.Namespace) -> str:
 def cmd_health(args: argparse.Namespace) -> int:
     logger = configure_logging()
     out = run_health(HealthIn(timeout=args.timeout), logger=logger)
-    _print_json(asdict(out))
+    _print_json(out)
     return 0 if out.connected else 1
 
 
@@ -38,7 +67,7 @@ def cmd_validate(args: argparse.Namespace) -> int:
         return 1
 
     out = run_validate(ValidateIn(order=order_payload, transmit=args.transmit))
-    _print_json(asdict(out))
+    _print_json(out)
     return 0 if out.valid else 1
 
 
@@ -61,7 +90,7 @@ def cmd_place(args: argparse.Namespace) -> int:
         logger=logger,
     )
 
-    _print_json(asdict(out))
+    _print_json(out)
     return 0 if out.submitted or out.dry_run else 1
 
 
@@ -69,7 +98,8 @@ def cmd_watch(args: argparse.Namespace) -> int:
     logger = configure_logging()
 
     def on_update(event: Dict[str, Any]) -> None:
-        _print_json(event)
+        # Flush per event so piped consumers see updates as they happen.
+        _print_json(event, flush=True)
 
     out = run_watch(
         WatchIn(
@@ -89,6 +119,14 @@ def cmd_watch(args: argparse.Namespace) -> int:
     return 0
 
 
+def _add_order_input_args(parser: argparse.ArgumentParser) -> None:
+    order_input = parser.add_mutually_exclusive_group(required=True)
+    order_input.add_argument("--json", type=str, help="Inline JSON payload")
+    order_input.add_argument("--json-file", type=str, help="Path to JSON payload file")
+    parser.add_argument("--transmit", action="store_true", help="Override payload and set transmit=true")
+
+
+@functools.lru_cache(maxsize=1)
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(prog="ibkr-cli")
     sub = parser.add_subparsers(dest="command", required=True)
@@ -98,17 +136,11 @@ def build_parser() -> argparse.ArgumentParser:
     health.set_defaults(func=cmd_health)
 
     validate = sub.add_parser("validate", help="Validate structured order JSON input")
-    validate_input = validate.add_mutually_exclusive_group(required=True)
-    validate_input.add_argument("--json", type=str, help="Inline JSON payload")
-    validate_input.add_argument("--json-file", type=str, help="Path to JSON payload file")
-    validate.add_argument("--transmit", action="store_true", help="Override payload and set transmit=true")
+    _add_order_input_args(validate)
     validate.set_defaults(func=cmd_validate)
 
     place = sub.add_parser("place", help="Submit a basic order")
-    place_input = place.add_mutually_exclusive_group(required=True)
-    place_input.add_argument("--json", type=str, help="Inline JSON payload")
-    place_input.add_argument("--json-file", type=str, help="Path to JSON payload file")
-    place.add_argument("--transmit", action="store_true", help="Override payload and set transmit=true")
+    _add_order_input_args(place)
     place.add_argument("--dry-run", action="store_true", help="Build contract/order but do not place")
     place.add_argument("--timeout", type=float, default=5.0, help="Seconds to wait for nextValidId")
     place.set_defaults(func=cmd_place)
@@ -1,8 +1,14 @@
 from __future__ import annotations
 
+import functools
 import os
 from dataclasses import dataclass
 
+try:
+    from dotenv import load_dotenv
+except Exception:  # pragma: no cover - python-dotenv is optional
+    load_dotenv = None
+
 
 @dataclass(frozen=True)
 class Config:
@@ -14,14 +20,13 @@ class Config:
 
 def _load_dotenv() -> None:
     """Best-effort .env loader without hard dependency."""
-    try:
-        from dotenv import load_dotenv
-    except Exception:
+    if load_dotenv is None:
         return
 
     load_dotenv()
 
 
+@functools.lru_cache(maxsize=1)
 def load_config() -> Config:
     _load_dotenv()
 
@@ -36,3 +41,8 @@ def load_config() -> Config:
         ib_client_id=ib_client_id,
         order_db_path=order_db_path,
     )
+
+
+def invalidate_config_cache() -> None:
+    """Drop the cached Config so the next load_config() re-reads the environment."""
+    load_config.cache_clear()
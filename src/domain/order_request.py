@@ -1,8 +1,12 @@
 from __future__ import annotations
 
-from typing import Literal
+from typing import Annotated, Literal
 
-from pydantic import BaseModel, ConfigDict, Field, PositiveFloat, field_validator, model_validator
+from pydantic import BaseModel, ConfigDict, Field, PositiveFloat, StringConstraints, field_validator, model_validator
+
+# Free-form codes are uppercased by pydantic-core itself; only the Literal
+# fields below still need a Python "before" validator to normalize case.
+UpperStr = Annotated[str, StringConstraints(to_upper=True)]
 
 
 class OrderRequest(BaseModel):
@@ -11,10 +15,10 @@ class OrderRequest(BaseModel):
     model_config = ConfigDict(extra="forbid", str_strip_whitespace=True)
 
     action: Literal["BUY", "SELL"]
-    symbol: str = Field(min_length=1)
+    symbol: UpperStr = Field(min_length=1)
     sec_type: Literal["STK"] = "STK"
-    exchange: str = "SMART"
-    currency: str = "USD"
+    exchange: UpperStr = "SMART"
+    currency: UpperStr = "USD"
     quantity: PositiveFloat
     order_type: Literal["MKT", "LMT"]
     tif: Literal["DAY", "GTC"] = "DAY"
@@ -25,19 +29,11 @@ class OrderRequest(BaseModel):
     client_tag: str | None = None
     order_ref: str | None = None
 
-    @field_validator(
-        "action",
-        "symbol",
-        "sec_type",
-        "exchange",
-        "currency",
-        "order_type",
-        "tif",
-        mode="before",
-    )
+    @field_validator("action", "sec_type", "order_type", "tif", mode="before")
     @classmethod
     def _normalize_uppercase(cls, value: str) -> str:
-        if isinstance(value, str):
+        # Programmatic callers usually send canonical values; don't reallocate those.
+        if isinstance(value, str) and not (value.isupper() and value == value.strip()):
             return value.strip().upper()
         return value
 
@@ -49,14 +45,6 @@ class OrderRequest(BaseModel):
         cleaned = value.strip()
         return cleaned or None
 
-    @field_validator("limit_price")
-    @classmethod
-    def _check_limit_price_precision(cls, value: float | None) -> float | None:
-        # Keep a simple precision guard for accidental huge decimals in manual CLI input.
-        if value is None:
-            return None
-        return round(value, 8)
-
     @model_validator(mode="after")
     def _validate_order_type_fields(self) -> "OrderRequest":
         if self.order_type == "LMT" and self.limit_price is None:
@@ -75,5 +63,7 @@ class OrderRequest(BaseModel):
         return self.order_ref or self.client_tag
 
     @classmethod
-    def from_json(cls, payload: str) -> "OrderRequest":
-        return cls.model_validate_json(payload)
+    def from_json(cls, payload: str | bytes) -> "OrderRequest":
+        # The schema validator is compiled once per class; call it directly and
+        # skip the model_validate_json wrapper on the hot CLI/API path.
+        return cls.__pydantic_validator__.validate_json(payload)
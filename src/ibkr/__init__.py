@@ -1,7 +1,32 @@
 """IBKR adapter package."""
 
-from .builders import build_contract, build_order
-from .client import IBApiClient
-from .order_store import OrderStore, is_terminal_status
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .builders import build_contract, build_order
+    from .client import IBApiClient
+    from .order_store import OrderStore, is_terminal_status
+
+# Re-exports resolve on first access (PEP 562), so importing one submodule such as
+# order_store does not also load ibapi's client machinery.
+_EXPORTS = {
+    "IBApiClient": ".client",
+    "OrderStore": ".order_store",
+    "build_contract": ".builders",
+    "build_order": ".builders",
+    "is_terminal_status": ".order_store",
+}
 
 __all__ = ["IBApiClient", "OrderStore", "build_contract", "build_order", "is_terminal_status"]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
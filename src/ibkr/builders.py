@@ -1,10 +1,17 @@
 from __future__ import annotations
 
+import copy
+
 from ibapi.contract import Contract
 from ibapi.order import Order
+from ibapi.softdollartier import SoftDollarTier
 
 from ..domain import OrderRequest
 
+# Order.__init__ assigns ~130 attributes; shallow-copying a pristine instance is
+# about twice as fast. Contract is small enough that constructing it is cheaper.
+_ORDER_TEMPLATE = Order()
+
 
 def build_contract(req: OrderRequest) -> Contract:
     contract = Contract()
@@ -20,7 +27,11 @@ def build_contract(req: OrderRequest) -> Contract:
 
 
 def build_order(req: OrderRequest) -> Order:
-    order = Order()
+    order = copy.copy(_ORDER_TEMPLATE)
+    # Order's mutable defaults (conditions and softDollarTier) would otherwise be
+    # shared with the template and every other built order; give each its own.
+    order.conditions = []
+    order.softDollarTier = SoftDollarTier("", "", "")
     order.action = req.action
     order.totalQuantity = req.quantity
     order.orderType = req.order_type
@@ -28,7 +39,8 @@ def build_order(req: OrderRequest) -> Order:
     order.transmit = req.transmit
 
     if req.order_type == "LMT" and req.limit_price is not None:
-        order.lmtPrice = req.limit_price
+        # Simple precision guard for accidental huge decimals in manual CLI input.
+        order.lmtPrice = round(req.limit_price, 8)
 
     if req.effective_order_ref:
         order.orderRef = req.effective_order_ref
@@ -2,7 +2,8 @@ from __future__ import annotations
 
 import logging
 import threading
-from typing import Any, Dict, Optional
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
 
 from ibapi.client import EClient
 from ibapi.contract import Contract
@@ -13,6 +14,37 @@ from ..domain import OrderRequest
 from .builders import build_contract, build_order
 from .order_store import OrderStore, normalize_status, utc_now_iso
 
+# IB API error callback shapes, keyed by len(args) after reqId (4+ share one entry):
+# 1) (errorCode, errorString, advancedOrderRejectJson?)
+# 2) (errorTime, errorCode, errorString, advancedOrderRejectJson?)
+# Each unpacker returns (error_time, error_code, error_string, advanced_reject).
+ErrorFields = Tuple[Optional[int], int, str, str]
+
+
+def _unpack_error_default(args: Tuple[Any, ...]) -> ErrorFields:
+    return None, -1, "", ""
+
+
+def _unpack_error_2(args: Tuple[Any, ...]) -> ErrorFields:
+    return None, int(args[0]), str(args[1]), ""
+
+
+def _unpack_error_3(args: Tuple[Any, ...]) -> ErrorFields:
+    if isinstance(args[1], int):
+        return int(args[0]), int(args[1]), str(args[2]), ""
+    return None, int(args[0]), str(args[1]), str(args[2] or "")
+
+
+def _unpack_error_4(args: Tuple[Any, ...]) -> ErrorFields:
+    return int(args[0]), int(args[1]), str(args[2]), str(args[3] or "")
+
+
+_ERROR_UNPACKERS: Dict[int, Callable[[Tuple[Any, ...]], ErrorFields]] = {
+    2: _unpack_error_2,
+    3: _unpack_error_3,
+    4: _unpack_error_4,
+}
+
 
 class IBApiClient(EWrapper, EClient):
     def __init__(self, logger: Optional[logging.Logger] = None, order_store: OrderStore | None = None) -> None:
@@ -26,6 +58,9 @@ class IBApiClient(EWrapper, EClient):
         self._sequence = 0
 
         self.next_valid_id: Optional[int] = None
+        # Order states are copy-on-write: _record_order_update publishes a new
+        # dict per update and never mutates a published one, so readers can
+        # share the snapshot without copying. Callers must treat it as read-only.
         self.orders: Dict[int, Dict[str, Any]] = {}
         self.order_store = order_store
 
@@ -53,6 +88,8 @@ class IBApiClient(EWrapper, EClient):
         finally:
             if self._thread:
                 self._thread.join(timeout=timeout)
+            if self.order_store:
+                self.order_store.flush(timeout=timeout)
 
     def submit_order(self, req: OrderRequest) -> int:
         if self.next_valid_id is None:
@@ -98,7 +135,7 @@ class IBApiClient(EWrapper, EClient):
         with self._orders_cv:
             state = self.orders.get(order_id)
             if state:
-                return dict(state)
+                return state
 
         if not self.order_store:
             return None
@@ -110,17 +147,19 @@ class IBApiClient(EWrapper, EClient):
         return persisted
 
     def wait_for_order_update(self, order_id: int, last_seq: int, timeout: float = 1.0) -> Dict[str, Any] | None:
+        # Keep waiting until this order advances or the deadline passes, so wake-ups
+        # for other orders (or spurious ones) don't end the wait early.
+        deadline = time.monotonic() + timeout
         with self._orders_cv:
-            state = self.orders.get(order_id)
-            if state and int(state.get("_seq", 0)) > last_seq:
-                return dict(state)
-
-            self._orders_cv.wait(timeout=timeout)
-            state = self.orders.get(order_id)
-            if state and int(state.get("_seq", 0)) > last_seq:
-                return dict(state)
+            while True:
+                state = self.orders.get(order_id)
+                if state and int(state.get("_seq", 0)) > last_seq:
+                    return state
 
-        return None
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._orders_cv.wait(timeout=remaining)
 
     def request_open_orders(self) -> None:
         self.reqOpenOrders()
@@ -146,10 +185,12 @@ class IBApiClient(EWrapper, EClient):
             self.orders[order_id] = state
 
             if self.order_store:
+                # Only queues the write (OrderStore commits in the background), so
+                # waiters are not held up behind SQLite.
                 self.order_store.upsert({k: v for k, v in state.items() if k != "_seq"})
 
             self._orders_cv.notify_all()
-            return dict(state)
+            return state
 
     # --- IB callbacks ---
     def nextValidId(self, orderId: int) -> None:  # noqa: N802
@@ -222,31 +263,8 @@ class IBApiClient(EWrapper, EClient):
         )
 
     def error(self, reqId: int, *args: Any) -> None:  # noqa: N802
-        error_time: int | None = None
-        error_code: int = -1
-        error_string: str = ""
-        advanced_reject: str = ""
-
-        # Handle both IB API callback shapes:
-        # 1) (reqId, errorCode, errorString, advancedOrderRejectJson?)
-        # 2) (reqId, errorTime, errorCode, errorString, advancedOrderRejectJson?)
-        if len(args) == 2:
-            error_code = int(args[0])
-            error_string = str(args[1])
-        elif len(args) == 3:
-            if isinstance(args[1], int):
-                error_time = int(args[0])
-                error_code = int(args[1])
-                error_string = str(args[2])
-            else:
-                error_code = int(args[0])
-                error_string = str(args[1])
-                advanced_reject = str(args[2] or "")
-        elif len(args) >= 4:
-            error_time = int(args[0])
-            error_code = int(args[1])
-            error_string = str(args[2])
-            advanced_reject = str(args[3] or "")
+        unpack = _ERROR_UNPACKERS.get(min(len(args), 4), _unpack_error_default)
+        error_time, error_code, error_string, advanced_reject = unpack(args)
 
         payload = {
             "req_id": reqId,
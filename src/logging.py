@@ -1,35 +1,75 @@
 from __future__ import annotations
 
+import functools
 import json
 import logging
 import sys
 from datetime import datetime, timezone
 from typing import Any, Dict
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+# Standard LogRecord attributes; anything else on a record came in via `extra=`.
+_RESERVED_LOG_ATTRS = frozenset(
+    {
+        "name",
+        "msg",
+        "args",
+        "levelname",
+        "levelno",
+        "pathname",
+        "filename",
+        "module",
+        "exc_info",
+        "exc_text",
+        "stack_info",
+        "lineno",
+        "funcName",
+        "created",
+        "msecs",
+        "relativeCreated",
+        "thread",
+        "threadName",
+        "processName",
+        "process",
+        "taskName",
+        "message",
+    }
+)
+
 
 class JsonFormatter(logging.Formatter):
     def format(self, record: logging.LogRecord) -> str:
+        # Stamp the time the record was created rather than when it is formatted.
+        created = datetime.fromtimestamp(record.created, tz=timezone.utc)
         payload: Dict[str, Any] = {
-            "ts": datetime.now(timezone.utc).isoformat(),
+            # orjson serializes datetimes natively (same ISO 8601 output as isoformat()).
+            "ts": created if orjson is not None else created.isoformat(),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
         }
 
-        # Attach extra fields if present
-        for key, value in record.__dict__.items():
-            if key.startswith("_"):
-                continue
-            if key in {"name", "msg", "args", "levelname", "levelno", "pathname", "filename", "module", "exc_info", "exc_text", "stack_info", "lineno", "funcName", "created", "msecs", "relativeCreated", "thread", "threadName", "processName", "process", "message"}:
-                continue
-            payload[key] = value
+        # Attach extra fields if present, in the order they were set.
+        extras = record.__dict__.keys() - _RESERVED_LOG_ATTRS
+        if extras:
+            for key, value in record.__dict__.items():
+                if key in extras and not key.startswith("_"):
+                    payload[key] = value
 
         if record.exc_info:
             payload["exc_info"] = self.formatException(record.exc_info)
 
+        if orjson is not None:
+            return orjson.dumps(payload, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
         return json.dumps(payload, default=str)
 
 
+@functools.lru_cache(maxsize=1)
 def configure_logging(level: str = "INFO") -> logging.Logger:
     logger = logging.getLogger()
     logger.setLevel(level)
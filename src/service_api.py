@@ -2,38 +2,44 @@ from __future__ import annotations
 
 import logging
 import time
+from collections import deque
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, Mapping, Tuple
+from typing import Any, Callable, Deque, Dict, Mapping, Sequence
 
 from pydantic import ValidationError
 
 from .config import Config, load_config
 from .domain import OrderRequest
-from .ibkr import IBApiClient, OrderStore, build_contract, build_order, is_terminal_status
 
-OrderInput = OrderRequest | Mapping[str, Any] | str
+# The IBKR adapter (and ibapi with it) is imported inside the functions that need
+# it, so validation-only callers never load it.
+
+OrderInput = OrderRequest | Mapping[str, Any] | str | bytes
 WatchUpdateHandler = Callable[[Dict[str, Any]], None]
 
+# run_watch keeps only the most recent updates; on_update still sees every one.
+_WATCH_UPDATES_MAXLEN = 256
+
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class HealthIn:
     timeout: float = 5.0
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class HealthOut:
     connected: bool
     next_valid_id: int | None
     error: str | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ValidateIn:
     order: OrderInput
     transmit: bool = False
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ValidateOut:
     valid: bool
     order_request: Dict[str, Any] | None = None
@@ -41,7 +47,7 @@ class ValidateOut:
     errors: list[Dict[str, Any]] | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PlaceIn:
     order: OrderInput
     transmit: bool = False
@@ -49,7 +55,7 @@ class PlaceIn:
     timeout: float = 5.0
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PlaceOut:
     submitted: bool
     dry_run: bool = False
@@ -63,7 +69,7 @@ class PlaceOut:
     error: str | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class WatchIn:
     order_id: int
     poll_interval: float = 1.0
@@ -71,12 +77,12 @@ class WatchIn:
     max_wait: float | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class WatchOut:
     order_id: int
     terminal: bool
     status: str | None = None
-    updates: list[Dict[str, Any]] | None = None
+    updates: Sequence[Dict[str, Any]] | None = None
     error: str | None = None
 
 
@@ -88,17 +94,17 @@ def _resolve_logger(logger: logging.Logger | None) -> logging.Logger:
     return logger or logging.getLogger(__name__)
 
 
-def _coerce_order_request(order_input: OrderInput, transmit: bool = False) -> OrderRequest:
+def coerce_order_request(order_input: OrderInput, transmit: bool = False) -> OrderRequest:
     if isinstance(order_input, OrderRequest):
         req = order_input
-    elif isinstance(order_input, str):
+    elif isinstance(order_input, (str, bytes)):
         req = OrderRequest.from_json(order_input)
     elif isinstance(order_input, Mapping):
         req = OrderRequest.model_validate(dict(order_input))
     else:
-        raise TypeError("order input must be OrderRequest, mapping, or JSON string")
+        raise TypeError("order input must be OrderRequest, mapping, or JSON string/bytes")
 
-    if transmit:
+    if transmit and not req.transmit:
         req = req.model_copy(update={"transmit": True})
 
     return req
@@ -128,20 +134,30 @@ def _to_order_dict(order: Any) -> Dict[str, Any]:
     return payload
 
 
-def _state_signature(state: Dict[str, Any]) -> Tuple[Any, Any, Any, Any]:
-    return (
-        state.get("last_update"),
-        state.get("status"),
-        state.get("filled"),
-        state.get("avg_fill_price"),
+def _state_signature(state: Dict[str, Any]) -> int:
+    return hash(
+        (
+            state.get("last_update"),
+            state.get("status"),
+            state.get("filled"),
+            state.get("avg_fill_price"),
+        )
     )
 
 
 def _validation_errors(exc: ValidationError) -> list[Dict[str, Any]]:
-    return list(exc.errors(include_url=False, include_context=False))
+    # validate_json reports malformed JSON and schema errors through this same
+    # ValidationError; for json_invalid the input is the raw payload, which may be bytes.
+    errors = exc.errors(include_url=False, include_context=False)
+    for error in errors:
+        if isinstance(error.get("input"), bytes):
+            error["input"] = error["input"].decode("utf-8", errors="replace")
+    return list(errors)
 
 
 def run_health(payload: HealthIn, *, config: Config | None = None, logger: logging.Logger | None = None) -> HealthOut:
+    from .ibkr import IBApiClient
+
     cfg = _resolve_config(config)
     log = _resolve_logger(logger)
 
@@ -163,7 +179,7 @@ def run_health(payload: HealthIn, *, config: Config | None = None, logger: loggi
 
 def run_validate(payload: ValidateIn) -> ValidateOut:
     try:
-        req = _coerce_order_request(payload.order, transmit=payload.transmit)
+        req = coerce_order_request(payload.order, transmit=payload.transmit)
     except ValidationError as exc:
         return ValidateOut(valid=False, errors=_validation_errors(exc))
     except Exception as exc:
@@ -177,11 +193,13 @@ def run_validate(payload: ValidateIn) -> ValidateOut:
 
 
 def run_place(payload: PlaceIn, *, config: Config | None = None, logger: logging.Logger | None = None) -> PlaceOut:
+    from .ibkr import IBApiClient, OrderStore, build_contract, build_order
+
     cfg = _resolve_config(config)
     log = _resolve_logger(logger)
 
     try:
-        req = _coerce_order_request(payload.order, transmit=payload.transmit)
+        req = coerce_order_request(payload.order, transmit=payload.transmit)
     except ValidationError as exc:
         return PlaceOut(submitted=False, errors=_validation_errors(exc))
     except Exception as exc:
@@ -212,6 +230,7 @@ def run_place(payload: PlaceIn, *, config: Config | None = None, logger: logging
         timeout=payload.timeout,
     )
     if not ok:
+        store.close()
         return PlaceOut(submitted=False, error="could not connect to TWS")
 
     try:
@@ -228,6 +247,7 @@ def run_place(payload: PlaceIn, *, config: Config | None = None, logger: logging
         return PlaceOut(submitted=False, error=str(exc), contract=contract_payload, order_payload=order_payload)
     finally:
         client.disconnect_and_wait()
+        store.close()
 
 
 def run_watch(
@@ -237,13 +257,17 @@ def run_watch(
     logger: logging.Logger | None = None,
     on_update: WatchUpdateHandler | None = None,
 ) -> WatchOut:
+    from .ibkr import IBApiClient, OrderStore
+    from .ibkr.order_store import TERMINAL_STATUSES
+
     cfg = _resolve_config(config)
     log = _resolve_logger(logger)
     store = OrderStore(cfg.order_db_path)
 
-    updates: list[Dict[str, Any]] = []
-    last_signature: Tuple[Any, Any, Any, Any] | None = None
+    updates: Deque[Dict[str, Any]] = deque(maxlen=_WATCH_UPDATES_MAXLEN)
+    last_signature: int | None = None
     start_time = time.monotonic()
+    deadline = start_time + payload.max_wait if payload.max_wait is not None else None
     state: Dict[str, Any] | None = None
 
     def emit(state: Dict[str, Any]) -> None:
@@ -252,16 +276,20 @@ def run_watch(
         if on_update:
             on_update(event)
 
+    # Both the store and the client normalize status on the way in, so the loop
+    # checks membership directly instead of going through is_terminal_status.
     persisted = store.get(payload.order_id)
     if persisted:
+        state = persisted
         last_signature = _state_signature(persisted)
         emit(persisted)
-        if is_terminal_status(persisted.get("status")):
+        if persisted["status"] in TERMINAL_STATUSES:
+            store.close()
             return WatchOut(
                 order_id=payload.order_id,
                 terminal=True,
                 status=persisted.get("status"),
-                updates=updates,
+                updates=list(updates),
             )
 
     client = IBApiClient(logger=log, order_store=store)
@@ -272,11 +300,12 @@ def run_watch(
         timeout=payload.timeout,
     )
     if not ok:
+        store.close()
         return WatchOut(
             order_id=payload.order_id,
             terminal=False,
             status=(persisted or {}).get("status") if persisted else None,
-            updates=updates,
+            updates=list(updates),
             error="could not connect to TWS",
         )
 
@@ -285,31 +314,42 @@ def run_watch(
 
     try:
         while True:
-            live_state = client.wait_for_order_update(payload.order_id, last_seq=last_seq, timeout=payload.poll_interval)
-            if live_state:
-                last_seq = int(live_state.get("_seq", last_seq))
-
-            state = store.get(payload.order_id) or live_state
-            if state:
+            timeout = payload.poll_interval
+            if deadline is not None:
+                timeout = min(timeout, max(deadline - time.monotonic(), 0.0))
+
+            # The client hands back the order's current (copy-on-write) state when it
+            # advances. When the wait times out, read the store instead: another
+            # process may have persisted updates, or placed an order this client
+            # has never seen.
+            current = client.wait_for_order_update(payload.order_id, last_seq=last_seq, timeout=timeout)
+            if current is not None:
+                last_seq = int(current.get("_seq", last_seq))
+            else:
+                current = store.get(payload.order_id)
+            if current:
+                state = current
                 signature = _state_signature(state)
                 if signature != last_signature:
                     last_signature = signature
-                    emit(state)
-
-                if is_terminal_status(state.get("status")):
-                    return WatchOut(
-                        order_id=payload.order_id,
-                        terminal=True,
-                        status=state.get("status"),
-                        updates=updates,
-                    )
-
-            if payload.max_wait is not None and (time.monotonic() - start_time) >= payload.max_wait:
+                    emit({k: v for k, v in state.items() if k != "_seq"})
+
+                    # A persisted terminal state already returned above, so a terminal
+                    # status can only show up as a change.
+                    if state.get("status") in TERMINAL_STATUSES:
+                        return WatchOut(
+                            order_id=payload.order_id,
+                            terminal=True,
+                            status=state.get("status"),
+                            updates=list(updates),
+                        )
+
+            if deadline is not None and time.monotonic() >= deadline:
                 return WatchOut(
                     order_id=payload.order_id,
                     terminal=False,
                     status=(state or {}).get("status") if state else None,
-                    updates=updates,
+                    updates=list(updates),
                     error="max_wait_exceeded",
                 )
     except KeyboardInterrupt:
@@ -317,8 +357,9 @@ def run_watch(
             order_id=payload.order_id,
             terminal=False,
             status=None,
-            updates=updates,
+            updates=list(updates),
             error="interrupted",
         )
     finally:
         client.disconnect_and_wait()
+        store.close()
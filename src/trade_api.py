@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import logging
 from dataclasses import dataclass
-from typing import Any, Dict
+from typing import Any, Dict, Sequence
+
+from pydantic import ValidationError
 
 from .config import Config
 from .service_api import (
@@ -11,13 +13,14 @@ from .service_api import (
     ValidateIn,
     WatchIn,
     WatchUpdateHandler,
+    coerce_order_request,
     run_place,
     run_validate,
     run_watch,
 )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TradeRequest:
     order: OrderInput
     transmit: bool = False
@@ -28,7 +31,7 @@ class TradeRequest:
     max_wait: float | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TradeResult:
     ok: bool
     submitted: bool = False
@@ -37,7 +40,7 @@ class TradeResult:
     status: str | None = None
     terminal: bool | None = None
     state: Dict[str, Any] | None = None
-    updates: list[Dict[str, Any]] | None = None
+    updates: Sequence[Dict[str, Any]] | None = None
     contract: Dict[str, Any] | None = None
     order_payload: Dict[str, Any] | None = None
     order_request: Dict[str, Any] | None = None
@@ -68,13 +71,20 @@ def execute_trade(
     try:
         request = _coerce_trade_request(payload)
 
-        validation = run_validate(ValidateIn(order=request.order, transmit=request.transmit))
+        # Parse the order once and hand the model to both steps; an unparseable order
+        # goes through as-is so run_validate reports the errors.
+        try:
+            order: OrderInput = coerce_order_request(request.order, transmit=request.transmit)
+        except (ValidationError, TypeError):
+            order = request.order
+
+        validation = run_validate(ValidateIn(order=order, transmit=request.transmit))
         if not validation.valid:
             return TradeResult(ok=False, errors=validation.errors)
 
         placement = run_place(
             PlaceIn(
-                order=request.order,
+                order=order,
                 transmit=request.transmit,
                 dry_run=request.dry_run,
                 timeout=request.timeout,
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from types import ModuleType
+from typing import Iterator
+
+import pytest
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    # Registered here so the marker is known even when pytest-xdist is not installed.
+    config.addinivalue_line("markers", "xdist_group(name): keep these tests on one pytest-xdist worker")
+
+
+@pytest.fixture(scope="session")
+def trade_api_module() -> ModuleType:
+    """src.trade_api, imported on first use and shared by the whole session."""
+    from src import trade_api
+
+    return trade_api
+
+
+@pytest.fixture(autouse=True)
+def fresh_config() -> Iterator[None]:
+    """Keep load_config()'s cached Config from leaking between tests."""
+    from src.config import invalidate_config_cache
+
+    invalidate_config_cache()
+    yield
+    invalidate_config_cache()
@@ -61,6 +61,15 @@ class BuildersTestCase(unittest.TestCase):
         self.assertFalse(order.transmit)
         self.assertEqual(order.orderRef, "ref-001")
 
+    def test_built_orders_do_not_share_mutable_defaults(self) -> None:
+        req = OrderRequest.model_validate({"action": "BUY", "symbol": "AAPL", "order_type": "MKT", "quantity": 1})
+
+        first = build_order(req)
+        second = build_order(req)
+
+        self.assertIsNot(first.conditions, second.conditions)
+        self.assertIsNot(first.softDollarTier, second.softDollarTier)
+
     def test_build_limit_order(self) -> None:
         req = OrderRequest.model_validate(
             {
@@ -85,6 +94,21 @@ class BuildersTestCase(unittest.TestCase):
         self.assertTrue(order.transmit)
         self.assertEqual(order.orderRef, "ref-002")
 
+    def test_build_limit_order_rounds_price_precision(self) -> None:
+        req = OrderRequest.model_validate(
+            {
+                "action": "BUY",
+                "symbol": "AAPL",
+                "order_type": "LMT",
+                "quantity": 1,
+                "limit_price": 190.123456789123,
+            }
+        )
+
+        order = build_order(req)
+
+        self.assertEqual(order.lmtPrice, 190.12345679)
+
 
 if __name__ == "__main__":
     unittest.main()
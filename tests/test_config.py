@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import os
+import unittest
+from unittest import mock
+
+from src.config import invalidate_config_cache, load_config
+
+
+class ConfigTestCase(unittest.TestCase):
+    def test_load_config_is_cached_until_invalidated(self) -> None:
+        with mock.patch.dict(os.environ, {"IB_PORT": "4001"}):
+            self.assertEqual(load_config().ib_port, 4001)
+
+            os.environ["IB_PORT"] = "4002"
+            self.assertEqual(load_config().ib_port, 4001)
+
+            invalidate_config_cache()
+            self.assertEqual(load_config().ib_port, 4002)
+
+
+if __name__ == "__main__":
+    unittest.main()
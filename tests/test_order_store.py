@@ -2,8 +2,11 @@ from __future__ import annotations
 
 import tempfile
 import unittest
+from decimal import Decimal
 from pathlib import Path
+from unittest import mock
 
+from src.ibkr import order_store
 from src.ibkr.order_store import OrderStore, is_terminal_status
 
 
@@ -30,6 +33,7 @@ class OrderStoreTestCase(unittest.TestCase):
             self.assertEqual(state["order_id"], 101)
             self.assertEqual(state["status"], "SUBMITTED")
             self.assertEqual(state["symbol"], "AAPL")
+            store.close()
 
     def test_upsert_preserves_existing_fields_on_partial_update(self) -> None:
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -63,6 +67,190 @@ class OrderStoreTestCase(unittest.TestCase):
             self.assertEqual(state["avg_fill_price"], 401.5)
             self.assertEqual(state["symbol"], "MSFT")
             self.assertEqual(state["limit_price"], 400.0)
+            store.close()
+
+    def test_upsert_many_merges_updates_within_one_batch(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = OrderStore(str(Path(tmpdir) / "orders.db"))
+            store.upsert_many(
+                [
+                    {"order_id": 303, "status": "SUBMITTING", "symbol": "AAPL", "quantity": 5},
+                    {"order_id": 303, "status": "SUBMITTED"},
+                    {"order_id": 304, "status": "SUBMITTED", "symbol": "MSFT"},
+                    {"order_id": 303, "status": "FILLED", "filled": 5, "avg_fill_price": 190.0},
+                ]
+            )
+
+            state = store.get(303)
+            assert state is not None
+            self.assertEqual(state["status"], "FILLED")
+            self.assertEqual(state["symbol"], "AAPL")
+            self.assertEqual(state["filled"], 5.0)
+            other = store.get(304)
+            store.close()
+            assert other is not None
+            self.assertEqual(other["symbol"], "MSFT")
+
+    def test_upsert_many_wins_over_an_earlier_queued_upsert(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = str(Path(tmpdir) / "orders.db")
+            store = OrderStore(db_path)
+            store.upsert({"order_id": 305, "status": "SUBMITTED", "symbol": "AAPL"})
+            store.upsert_many([{"order_id": 305, "status": "FILLED"}])
+
+            state = store.get(305)
+            self.assertTrue(store.flush())
+            store.close()
+            assert state is not None
+            self.assertEqual(state["status"], "FILLED")
+
+            reopened = OrderStore(db_path)
+            persisted = reopened.get(305)
+            reopened.close()
+            assert persisted is not None
+            self.assertEqual(persisted["status"], "FILLED")
+            self.assertEqual(persisted["symbol"], "AAPL")
+
+    def test_queued_updates_are_readable_and_persisted_on_close(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = str(Path(tmpdir) / "orders.db")
+            store = OrderStore(db_path)
+            store.upsert({"order_id": 404, "status": "submitted", "symbol": "AAPL", "quantity": 3})
+            store.upsert({"order_id": 404, "status": "Filled", "filled": 3, "avg_fill_price": 189.5})
+
+            state = store.get(404)
+            assert state is not None
+            self.assertEqual(state["status"], "FILLED")
+            self.assertEqual(state["symbol"], "AAPL")
+            store.close()
+
+            reopened = OrderStore(db_path)
+            persisted = reopened.get(404)
+            reopened.close()
+            assert persisted is not None
+            self.assertEqual(persisted["status"], "FILLED")
+            self.assertEqual(persisted["filled"], 3.0)
+            self.assertEqual(persisted["avg_fill_price"], 189.5)
+            self.assertEqual(persisted["symbol"], "AAPL")
+
+    def test_failed_update_does_not_drop_the_rest_of_its_batch(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = str(Path(tmpdir) / "orders.db")
+            store = OrderStore(db_path)
+            with self.assertLogs("src.ibkr.order_store", level="ERROR"):
+                store.upsert({"order_id": 707, "status": "FILLED", "symbol": "AAPL", "filled": 1})
+                # sqlite3 cannot bind Decimal, so this order's row fails to write.
+                store.upsert({"order_id": 708, "status": "SUBMITTED", "remaining": Decimal("1")})
+                self.assertFalse(store.flush())
+            self.assertTrue(store.flush())
+
+            self.assertIsNone(store.get(708))
+            store.close()
+
+            reopened = OrderStore(db_path)
+            persisted = reopened.get(707)
+            reopened.close()
+            assert persisted is not None
+            self.assertEqual(persisted["status"], "FILLED")
+
+    def test_upsert_many_raises_only_its_own_write_errors(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = OrderStore(str(Path(tmpdir) / "orders.db"))
+            with self.assertLogs("src.ibkr.order_store", level="ERROR"):
+                store.upsert({"order_id": 710, "status": "SUBMITTED", "remaining": Decimal("1")})
+                store.upsert_many([{"order_id": 711, "status": "FILLED", "symbol": "AAPL"}])
+                self.assertFalse(store.flush())
+
+            with self.assertRaises(Exception):
+                store.upsert_many([{"order_id": 712, "status": "SUBMITTED", "remaining": Decimal("1")}])
+            self.assertTrue(store.flush())
+            self.assertIsNone(store.get(712))
+
+            state = store.get(711)
+            store.close()
+            assert state is not None
+            self.assertEqual(state["status"], "FILLED")
+
+    def test_mistyped_field_does_not_drop_the_update(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = str(Path(tmpdir) / "orders.db")
+            store = OrderStore(db_path)
+            store.upsert({"order_id": 709, "status": "FILLED", "filled": 2, "last_error_code": "n/a"})
+            self.assertTrue(store.flush())
+            store.close()
+
+            reopened = OrderStore(db_path)
+            persisted = reopened.get(709)
+            reopened.close()
+            assert persisted is not None
+            self.assertEqual(persisted["status"], "FILLED")
+            self.assertEqual(persisted["last_error_code"], "n/a")
+
+    def test_persisted_state_is_rebuilt_from_columns(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = str(Path(tmpdir) / "orders.db")
+            store = OrderStore(db_path)
+            store.upsert({"order_id": 606, "status": "SUBMITTED", "symbol": "AAPL", "transmit": True, "quantity": 4})
+            store.upsert({"order_id": 606, "filled": 1, "remaining": 3, "last_fill_price": 190.25})
+            store.close()
+
+            reopened = OrderStore(db_path)
+            persisted = reopened.get(606)
+            reopened.close()
+            assert persisted is not None
+            self.assertIs(persisted["transmit"], True)
+            self.assertEqual(persisted["remaining"], 3.0)
+            self.assertEqual(persisted["last_fill_price"], 190.25)
+            self.assertEqual(persisted["status"], "SUBMITTED")
+
+    def test_get_serves_cached_state_as_independent_copies(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = OrderStore(str(Path(tmpdir) / "orders.db"))
+            store.upsert({"order_id": 505, "status": "SUBMITTED", "symbol": "AAPL", "quantity": 1})
+            store.flush()
+
+            first = store.get(505)
+            assert first is not None
+            first["symbol"] = "MUTATED"
+            store.upsert({"order_id": 505, "status": "filled", "filled": 1})
+
+            second = store.get(505)
+            store.close()
+            assert second is not None
+            self.assertEqual(second["symbol"], "AAPL")
+            self.assertEqual(second["status"], "FILLED")
+            self.assertEqual(second["filled"], 1)
+
+    def test_cached_state_expires_so_other_writers_become_visible(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = str(Path(tmpdir) / "orders.db")
+            reader = OrderStore(db_path)
+            writer = OrderStore(db_path)
+            writer.upsert({"order_id": 515, "status": "SUBMITTED", "symbol": "AAPL"})
+            writer.flush()
+            first = reader.get(515)
+
+            writer.upsert({"order_id": 515, "status": "FILLED", "filled": 1})
+            writer.flush()
+            cached = reader.get(515)
+            with mock.patch.object(order_store, "_CACHE_TTL", 0.0):
+                refreshed = reader.get(515)
+            writer.close()
+            reader.close()
+            assert first is not None and cached is not None and refreshed is not None
+            self.assertEqual((first["status"], cached["status"], refreshed["status"]), ("SUBMITTED", "SUBMITTED", "FILLED"))
+
+    def test_cache_keeps_only_the_most_recently_read_orders(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = OrderStore(str(Path(tmpdir) / "orders.db"))
+            with mock.patch.object(order_store, "_CACHE_MAX_ORDERS", 2):
+                for order_id in (521, 522, 523):
+                    store.upsert({"order_id": order_id, "status": "SUBMITTED"})
+                    store.flush()
+                    store.get(order_id)
+                cached = list(store._cache)
+            store.close()
+            self.assertEqual(cached, [522, 523])
 
     def test_terminal_status_detection(self) -> None:
         self.assertTrue(is_terminal_status("filled"))
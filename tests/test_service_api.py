@@ -23,6 +23,14 @@ class ServiceApiTestCase(unittest.TestCase):
         assert out.order_request is not None
         self.assertEqual(out.order_request["symbol"], "AAPL")
 
+    def test_run_validate_accepts_json_bytes(self) -> None:
+        out = run_validate(ValidateIn(order=b'{"action": "buy", "symbol": "aapl", "order_type": "MKT", "quantity": 1}'))
+
+        self.assertTrue(out.valid)
+        assert out.order_request is not None
+        self.assertEqual(out.order_request["action"], "BUY")
+        self.assertEqual(out.order_request["symbol"], "AAPL")
+
     def test_run_validate_failure(self) -> None:
         out = run_validate(
             ValidateIn(
@@ -38,6 +46,14 @@ class ServiceApiTestCase(unittest.TestCase):
         self.assertFalse(out.valid)
         self.assertIsNotNone(out.errors)
 
+    def test_run_validate_reports_malformed_json_as_validation_error(self) -> None:
+        out = run_validate(ValidateIn(order=b'{"action": "BUY",'))
+
+        self.assertFalse(out.valid)
+        assert out.errors is not None
+        self.assertEqual(out.errors[0]["type"], "json_invalid")
+        self.assertEqual(out.errors[0]["input"], '{"action": "BUY",')
+
     def test_run_place_dry_run(self) -> None:
         out = run_place(
             PlaceIn(
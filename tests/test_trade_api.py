@@ -1,115 +1,159 @@
 from __future__ import annotations
 
-import unittest
-from unittest.mock import patch
+import functools
+from dataclasses import dataclass, field
+from types import ModuleType
+from typing import Any, Callable, Dict, List
 
-import src
-from src.service_api import PlaceOut, ValidateOut, WatchOut
-from src.trade_api import execute_trade
-
-
-class TradeApiTestCase(unittest.TestCase):
-    def test_top_level_exports_are_locked_down(self) -> None:
-        self.assertEqual(sorted(src.__all__), ["TradeRequest", "TradeResult", "execute_trade"])
-
-    @patch("src.trade_api.run_place")
-    @patch("src.trade_api.run_validate")
-    def test_execute_trade_validation_failure(self, mock_validate, mock_place) -> None:
-        mock_validate.return_value = ValidateOut(valid=False, errors=[{"type": "value_error", "msg": "bad"}])
+import pytest
 
-        out = execute_trade({"order": {"action": "BUY"}})
-
-        self.assertFalse(out.ok)
-        self.assertEqual(out.errors, [{"type": "value_error", "msg": "bad"}])
-        mock_place.assert_not_called()
+from src.service_api import PlaceOut, ValidateOut, WatchOut
 
-    @patch("src.trade_api.run_place")
-    @patch("src.trade_api.run_validate")
-    def test_execute_trade_dry_run(self, mock_validate, mock_place) -> None:
-        mock_validate.return_value = ValidateOut(valid=True, order_request={"symbol": "AAPL"})
-        mock_place.return_value = PlaceOut(
+# Every test here patches the same trade_api globals; under pytest-xdist
+# (--dist=loadgroup) they stay on one worker, which imports trade_api once.
+pytestmark = pytest.mark.xdist_group(name="trade_api")
+
+# Canned service outputs, built once and shared by the scenarios (the dataclasses
+# are frozen and execute_trade never mutates them). Expected values are spelled
+# out separately, so a pass-through is not just compared with itself.
+_SYM = {"symbol": "AAPL"}
+_MKT = {"order_type": "MKT"}
+_SUBMITTED = {"status": "SUBMITTED"}
+_FILLED = {"status": "FILLED"}
+_VALID = ValidateOut(valid=True, order_request=_SYM)
+
+
+@functools.lru_cache(maxsize=None)
+def _place_submitted(order_id: int) -> PlaceOut:
+    return PlaceOut(submitted=True, order_id=order_id, state=_SUBMITTED, contract=_SYM, order_payload=_MKT)
+
+
+@dataclass(frozen=True)
+class Scenario:
+    id: str
+    payload: Dict[str, Any]
+    validate_out: ValidateOut = _VALID
+    place_out: PlaceOut | None = None
+    watch_out: WatchOut | None = None
+    expected: Dict[str, Any] = field(default_factory=dict)
+
+
+SCENARIOS = [
+    Scenario(
+        id="validation_failure",
+        payload={"order": {"action": "BUY"}},
+        validate_out=ValidateOut(valid=False, errors=[{"type": "value_error", "msg": "bad"}]),
+        expected={"ok": False, "errors": [{"type": "value_error", "msg": "bad"}]},
+    ),
+    Scenario(
+        id="dry_run",
+        payload={"order": {"action": "BUY"}, "dry_run": True},
+        place_out=PlaceOut(
             submitted=False,
             dry_run=True,
-            contract={"symbol": "AAPL"},
-            order_payload={"order_type": "MKT"},
-            order_request={"symbol": "AAPL"},
+            contract=_SYM,
+            order_payload=_MKT,
+            order_request=_SYM,
             effective_order_ref="ref-1",
-        )
-
-        out = execute_trade({"order": {"action": "BUY"}, "dry_run": True})
-
-        self.assertTrue(out.ok)
-        self.assertTrue(out.dry_run)
-        self.assertEqual(out.contract, {"symbol": "AAPL"})
-        self.assertEqual(out.order_payload, {"order_type": "MKT"})
-
-    @patch("src.trade_api.run_watch")
-    @patch("src.trade_api.run_place")
-    @patch("src.trade_api.run_validate")
-    def test_execute_trade_submit_without_wait(self, mock_validate, mock_place, mock_watch) -> None:
-        mock_validate.return_value = ValidateOut(valid=True, order_request={"symbol": "AAPL"})
-        mock_place.return_value = PlaceOut(
-            submitted=True,
-            order_id=42,
-            state={"status": "SUBMITTED"},
-            contract={"symbol": "AAPL"},
-            order_payload={"order_type": "MKT"},
-        )
-
-        out = execute_trade({"order": {"action": "BUY"}, "wait_for_terminal": False})
-
-        self.assertTrue(out.ok)
-        self.assertTrue(out.submitted)
-        self.assertEqual(out.order_id, 42)
-        self.assertEqual(out.status, "SUBMITTED")
-        mock_watch.assert_not_called()
-
-    @patch("src.trade_api.run_watch")
-    @patch("src.trade_api.run_place")
-    @patch("src.trade_api.run_validate")
-    def test_execute_trade_wait_for_terminal_success(self, mock_validate, mock_place, mock_watch) -> None:
-        mock_validate.return_value = ValidateOut(valid=True, order_request={"symbol": "AAPL"})
-        mock_place.return_value = PlaceOut(
-            submitted=True,
-            order_id=99,
-            state={"status": "SUBMITTED"},
-            contract={"symbol": "AAPL"},
-            order_payload={"order_type": "MKT"},
-        )
-        mock_watch.return_value = WatchOut(
+        ),
+        expected={"ok": True, "dry_run": True, "contract": {"symbol": "AAPL"}, "order_payload": {"order_type": "MKT"}},
+    ),
+    Scenario(
+        id="submit_without_wait",
+        payload={"order": {"action": "BUY"}, "wait_for_terminal": False},
+        place_out=_place_submitted(42),
+        expected={"ok": True, "submitted": True, "order_id": 42, "status": "SUBMITTED"},
+    ),
+    Scenario(
+        id="wait_for_terminal_success",
+        payload={"order": {"action": "BUY"}, "wait_for_terminal": True},
+        place_out=_place_submitted(99),
+        watch_out=WatchOut(
             order_id=99,
             terminal=True,
             status="FILLED",
-            updates=[{"event": "order_update", "order_id": 99, "state": {"status": "FILLED"}}],
-        )
-
-        out = execute_trade({"order": {"action": "BUY"}, "wait_for_terminal": True})
-
-        self.assertTrue(out.ok)
-        self.assertEqual(out.status, "FILLED")
-        self.assertTrue(out.terminal)
-        self.assertEqual(out.state, {"status": "FILLED"})
-
-    @patch("src.trade_api.run_watch")
-    @patch("src.trade_api.run_place")
-    @patch("src.trade_api.run_validate")
-    def test_execute_trade_watch_error(self, mock_validate, mock_place, mock_watch) -> None:
-        mock_validate.return_value = ValidateOut(valid=True, order_request={"symbol": "AAPL"})
-        mock_place.return_value = PlaceOut(
-            submitted=True,
-            order_id=11,
-            state={"status": "SUBMITTED"},
-            contract={"symbol": "AAPL"},
-            order_payload={"order_type": "MKT"},
-        )
-        mock_watch.return_value = WatchOut(order_id=11, terminal=False, status="SUBMITTED", error="max_wait_exceeded")
-
-        out = execute_trade({"order": {"action": "BUY"}, "wait_for_terminal": True})
-
-        self.assertFalse(out.ok)
-        self.assertEqual(out.order_id, 11)
-        self.assertEqual(out.error, "max_wait_exceeded")
-
-
-if __name__ == "__main__":
-    unittest.main()
+            updates=[{"event": "order_update", "order_id": 99, "state": _FILLED}],
+        ),
+        expected={"ok": True, "status": "FILLED", "terminal": True, "state": {"status": "FILLED"}},
+    ),
+    Scenario(
+        id="watch_error",
+        payload={"order": {"action": "BUY"}, "wait_for_terminal": True},
+        place_out=_place_submitted(11),
+        watch_out=WatchOut(order_id=11, terminal=False, status="SUBMITTED", error="max_wait_exceeded"),
+        expected={"ok": False, "order_id": 11, "error": "max_wait_exceeded"},
+    ),
+]
+
+
+def _patch_all(monkeypatch: pytest.MonkeyPatch, module: ModuleType, **replacements: Any) -> None:
+    for name, value in replacements.items():
+        monkeypatch.setattr(module, name, value)
+
+
+def _stub(calls: List[str], name: str, result: Any) -> Callable[..., Any]:
+    def stub(*args: Any, **kwargs: Any) -> Any:
+        calls.append(name)
+        return result
+
+    return stub
+
+
+EXPECTED_EXPORTS = frozenset({"TradeRequest", "TradeResult", "execute_trade"})
+
+
+def test_top_level_exports_are_locked_down() -> None:
+    import src
+
+    assert frozenset(src.__all__) == EXPECTED_EXPORTS
+
+
+@pytest.mark.parametrize("scenario", SCENARIOS, ids=lambda scenario: scenario.id)
+def test_execute_trade(
+    scenario: Scenario,
+    monkeypatch: pytest.MonkeyPatch,
+    trade_api_module: ModuleType,
+) -> None:
+    calls: List[str] = []
+    _patch_all(
+        monkeypatch,
+        trade_api_module,
+        run_validate=_stub(calls, "run_validate", scenario.validate_out),
+        run_place=_stub(calls, "run_place", scenario.place_out),
+        run_watch=_stub(calls, "run_watch", scenario.watch_out),
+    )
+
+    out = trade_api_module.execute_trade(scenario.payload)
+
+    # One tuple compare per check; pytest still reports the differing positions.
+    assert tuple(getattr(out, name) for name in scenario.expected) == tuple(scenario.expected.values())
+    # Later stages only run when the scenario provides their output.
+    assert ("run_place" in calls, "run_watch" in calls) == (
+        scenario.place_out is not None,
+        scenario.watch_out is not None,
+    )
+
+
+def test_execute_trade_parses_the_order_once(monkeypatch: pytest.MonkeyPatch, trade_api_module: ModuleType) -> None:
+    from src.domain import OrderRequest
+
+    received: List[Any] = []
+
+    def validate(payload: Any) -> ValidateOut:
+        received.append(payload.order)
+        return _VALID
+
+    def place(payload: Any, **kwargs: Any) -> PlaceOut:
+        received.append(payload.order)
+        return _place_submitted(42)
+
+    _patch_all(monkeypatch, trade_api_module, run_validate=validate, run_place=place)
+
+    out = trade_api_module.execute_trade(
+        {"order": {"action": "buy", "symbol": "aapl", "order_type": "MKT", "quantity": 1}, "transmit": True}
+    )
+
+    assert out.ok
+    validated, placed = received
+    assert isinstance(placed, OrderRequest)
+    assert (validated is placed, placed.symbol, placed.transmit) == (True, "AAPL", True)